@@ -3,16 +3,74 @@ This file contains a helper class for automating interactions with jollytur.com
 using Selenium. It does not handle any Scrapy logic.
 """
 
-import time
+import os
+import functools
+import queue
+import shutil
+import tempfile
 import undetected_chromedriver as uc
 
+from concurrent.futures import ThreadPoolExecutor
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+
+# Scrolls the page until the element at the given XPath is visible in the viewport
+# (its center is not covered by another element), checking every 200 ms.
+# Arguments: xpath, scroll step in pixels, maximum number of scrolls.
+# Resolves with the element, or null if it was not found or did not become visible.
+SCROLL_UNTIL_VISIBLE_JS = """
+var xpath = arguments[0], step = arguments[1], maxScrolls = arguments[2],
+    done = arguments[arguments.length - 1];
+var elem = document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!elem) {
+    done(null);
+    return;
+}
+function isInViewport() {
+    var box = elem.getBoundingClientRect(),
+        cx = box.left + (box.width / 2),
+        cy = box.top + (box.height / 2);
+    return document.elementFromPoint(cx, cy) === elem;
+}
+var scrolls = 0;
+(function check() {
+    if (isInViewport()) {
+        done(elem);
+    } else if (scrolls >= maxScrolls) {
+        done(null);
+    } else {
+        window.scrollBy(0, step);
+        scrolls++;
+        setTimeout(check, 200);
+    }
+})();
+"""
+
+
+# URL patterns of resources the browser does not need to download while scraping
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.woff*", "*.ttf", "*.mp4",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*", "*facebook.net*",
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _driver_path():
+    """
+    Resolves the chromedriver binary once per process, since ChromeDriverManager().install()
+    checks the filesystem (and possibly the network) on every call.
+    """
+    return ChromeDriverManager().install()
 
 
 class JollyTurSeleniumDriver:
@@ -26,50 +84,230 @@ class JollyTurSeleniumDriver:
       - Close the browser once all operations are finished
     """
 
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, driver_path=None, user_data_dir=None,
+                 capture_network=False, cache_dir=None):
         """
         Initializes the Selenium WebDriver.
 
         :param headless: If True, the browser will run in headless mode (invisible in the UI).
                          If False, you will see the browser in action.
+        :param driver_path: Path to an already installed chromedriver binary.
+                            If None, the path resolved by ChromeDriverManager is used.
+        :param user_data_dir: Chrome profile directory. Parallel browsers need separate
+                              directories to avoid profile-lock conflicts.
+                              If None, a fresh temporary profile is created for this
+                              session and removed again by close().
+        :param capture_network: If True, enables DevTools events so that the XHR requests
+                                behind the search form can be recorded (see capture_xhr_requests()).
+        :param cache_dir: Directory for Chrome's HTTP disk cache. Reusing it across runs keeps
+                          the site's static assets cached. This is purely a speed optimization;
+                          concurrent browsers must not share the same directory.
         """
-        chrome_options = Options()
+        # uc.ChromeOptions (not Selenium's Options): undetected-chromedriver attaches to an
+        # already running Chrome, which rejects 'prefs'; uc writes them into the profile instead
+        chrome_options = uc.ChromeOptions()
         if headless:
             # Headless mode: runs without opening a visible browser window
-            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--headless=new")
+
+        # Reduce resource usage: we only need the DOM, not rendered images
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        # Keep the tab running at full speed during long scrolls, and skip
+        # background features (translate, crash reporting, component extensions)
+        chrome_options.add_argument("--disable-renderer-backgrounding")
+        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+        chrome_options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
+        chrome_options.add_argument("--disable-ipc-flooding-protection")
+        chrome_options.add_argument("--disable-breakpad")
+        chrome_options.add_argument("--disable-component-extensions-with-background-pages")
+        # Scrolling is driven by JavaScript, so scrollbars are not needed
+        chrome_options.add_argument("--hide-scrollbars")
+        chrome_options.add_experimental_option(
+            "prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+                "credentials_enable_service": False,
+                "profile.password_manager_enabled": False,
+                "safebrowsing.enabled": False
+            }
+        )
+        # driver.get() returns on DOMContentLoaded instead of waiting for the full 'load' event
+        chrome_options.page_load_strategy = "eager"
+
+        if cache_dir:
+            # Persistent HTTP cache (256 MB) kept outside the profile directory
+            chrome_options.add_argument(f"--disk-cache-dir={cache_dir}")
+            chrome_options.add_argument("--disk-cache-size=268435456")
+
+        # Without an explicit profile, start every crawl from an empty, throwaway one:
+        # nothing is loaded from (or written back to) disk, and no cookies leak between crawls
+        self._temp_user_data_dir = None
+        if user_data_dir is None:
+            self._temp_user_data_dir = user_data_dir = tempfile.mkdtemp(prefix="jolly-chrome-")
+            chrome_options.add_argument("--disable-back-forward-cache")
+            # No --incognito: the profile is already fresh and deleted afterwards, and an
+            # incognito session would not use the prefs above, which uc writes into the profile
+            if not cache_dir:
+                # The cache would be thrown away with the profile, so do not write one
+                chrome_options.add_argument("--disk-cache-size=0")
 
         # Use Undetected ChromeDriver to reduce blocking or detection issues
         self.driver = uc.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
+            driver_executable_path=driver_path or _driver_path(),
+            options=chrome_options,
+            user_data_dir=user_data_dir,
+            enable_cdp_events=capture_network
         )
         # Set the browser window size to avoid hidden elements
         self.driver.set_window_size(1300, 1000)
+        # Allow in-browser loops (see SCROLL_UNTIL_VISIBLE_JS) enough time to finish
+        self.driver.set_script_timeout(30)
+
+        # Drop images, fonts, videos and trackers at the network level; the scraper only reads the DOM
+        self._block_resources()
 
         # WebDriverWait for explicit waiting until certain conditions are met
         self.wait = WebDriverWait(self.driver, 10)
         # Shortcut to Expected Conditions (EC) for readability
         self.EC = EC
         self.NoSuchElementException = NoSuchElementException
+        # XHR/fetch requests recorded by capture_xhr_requests()
+        self.captured_requests = []
+
+    def wait_until(self, condition, timeout=5):
+        """
+        Polls the page until the given condition is met, instead of sleeping for a fixed time.
 
-    def open_site(self, url="https://www.jollytur.com/"):
+        :param condition: An Expected Condition (or any callable taking the driver).
+        :param timeout: Maximum number of seconds to wait before raising TimeoutException.
+        :return: Whatever the condition returned once it succeeded.
+        """
+        return WebDriverWait(
+            self.driver,
+            timeout,
+            ignored_exceptions=(StaleElementReferenceException,)
+        ).until(condition)
+
+    def wait_for_staleness(self, element, timeout=1):
+        """
+        Waits until the given element is detached from the DOM, i.e. the part of
+        the page it belongs to has been re-rendered.
+
+        :param element: A WebElement expected to be replaced.
+        :param timeout: Maximum number of seconds to wait (at most the fixed pause this replaces).
+                        If the element is still attached by then, the page is assumed
+                        to have been updated in place.
+        """
+        try:
+            self.wait_until(self.EC.staleness_of(element), timeout)
+        except TimeoutException:
+            pass
+
+    def capture_xhr_requests(self):
+        """
+        Starts recording every XHR/fetch request the page sends (URL, method, headers and body).
+
+        This is meant to be run once while filling the search form, to find out whether
+        the results come from a JSON API that could be called without a browser.
+        Requires the driver to be created with capture_network=True.
+        """
+        def on_request(message):
+            params = message.get("params", {})
+            if params.get("type") not in ("XHR", "Fetch"):
+                return
+            request = params.get("request", {})
+            self.captured_requests.append({
+                "url": request.get("url"),
+                "method": request.get("method"),
+                "headers": request.get("headers"),
+                "post_data": request.get("postData")
+            })
+
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.add_cdp_listener("Network.requestWillBeSent", on_request)
+
+    def new_tab(self, url="about:blank"):
+        """
+        Opens a new tab in the same browser via the DevTools protocol.
+
+        Tabs share one Chrome process, which is much lighter than launching
+        another driver when full isolation is not needed.
+
+        :param url: The URL to load in the new tab.
+        :return: The window handle of the new tab.
+        """
+        # The tab starts blank so resource blocking is in place before the page loads
+        target_id = self.driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "newWindow": False}
+        )["targetId"]
+        handles = self.driver.window_handles
+        # ChromeDriver uses the target id as the window handle; fall back to the newest handle
+        handle = target_id if target_id in handles else handles[-1]
+
+        current_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(handle)
+        # DevTools commands only apply to the tab they are sent to
+        self._block_resources()
+        if url != "about:blank":
+            # Start loading without waiting for it, like Target.createTarget does
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+        self.driver.switch_to.window(current_handle)
+        return handle
+
+    def _block_resources(self):
+        """
+        Blocks the URLs in BLOCKED_URL_PATTERNS in the current tab.
+        """
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+    def close_tab(self, window_handle):
+        """
+        Closes a tab opened with new_tab() and switches back to the first remaining tab.
+
+        :param window_handle: The handle returned by new_tab().
+        """
+        self.driver.switch_to.window(window_handle)
+        self.driver.close()
+        self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def switch_to(self, window_handle=None):
+        """
+        Makes the given tab the active one. Does nothing if window_handle is None.
+
+        :param window_handle: The tab to switch to, or None to stay on the current tab.
+        """
+        if window_handle is not None:
+            self.driver.switch_to.window(window_handle)
+
+    def open_site(self, url="https://www.jollytur.com/", window_handle=None):
         """
         Navigates to the specified URL and waits for the 'destination' element to load.
 
         :param url: The URL to open. Defaults to the jollytur.com homepage.
+        :param window_handle: Tab to run in (see new_tab()). Defaults to the current tab.
         """
+        self.switch_to(window_handle)
         self.driver.get(url)
         # Wait until 'destination' input is located on the page
         self.wait.until(
             self.EC.presence_of_element_located((By.NAME, "destination"))
         )
 
-    def set_destination(self, destination_text="Kemer"):
+    def set_destination(self, destination_text="Kemer", window_handle=None):
         """
         Sets the 'destination' field in the search form.
 
         :param destination_text: Text to be entered into the 'destination' field (e.g. "Kemer").
+        :param window_handle: Tab to run in (see new_tab()). Defaults to the current tab.
         """
+        self.switch_to(window_handle)
         # Wait until the destination field is clickable
         destination = self.wait.until(
             self.EC.element_to_be_clickable((By.NAME, "destination"))
@@ -79,11 +317,16 @@ class JollyTurSeleniumDriver:
         destination.clear()
         destination.send_keys(destination_text)
 
-        # Pause briefly to allow the autocomplete suggestions to appear
-        time.sleep(2)
+        # Wait for the autocomplete suggestions to appear
+        try:
+            self.wait_until(
+                self.EC.visibility_of_element_located((By.CSS_SELECTOR, "ul.ui-autocomplete li"))
+            )
+        except TimeoutException:
+            print("No autocomplete suggestions appeared for the destination.")
 
     def select_dates(self, target_month="Ağustos", target_year="2025",
-                     checkin_day="4", checkout_day="8"):
+                     checkin_day="4", checkout_day="8", window_handle=None):
         """
         Opens the date selection widget and chooses the desired check-in/out days.
 
@@ -96,46 +339,54 @@ class JollyTurSeleniumDriver:
         :param target_year:  The year to select on the calendar (e.g. "2025").
         :param checkin_day:  The day of the month for check-in (string).
         :param checkout_day: The day of the month for check-out (string).
+        :param window_handle: Tab to run in (see new_tab()). Defaults to the current tab.
         """
+        self.switch_to(window_handle)
+
         # Click the date row to open the calendar
         date_row = self.wait.until(
-            self.EC.element_to_be_clickable((By.XPATH, "//div[@class='date-row']"))
+            self.EC.element_to_be_clickable((By.CSS_SELECTOR, "div.date-row"))
         )
         date_row.click()
 
         # Ensure the calendar has loaded
         self.wait.until(
-            self.EC.presence_of_element_located((By.XPATH, "//div[@class='ui-datepicker-title']"))
+            self.EC.presence_of_element_located((By.CSS_SELECTOR, "div.ui-datepicker-title"))
         )
 
-        # Loop until we find the desired month/year in the calendar header
-        while True:
-            current_month = self.driver.find_element(
-                By.XPATH,
-                "//div[@class='ui-datepicker-title']/span[@class='ui-datepicker-month']"
-            ).text
-            current_year = self.driver.find_element(
-                By.XPATH,
-                "//div[@class='ui-datepicker-title']/span[@class='ui-datepicker-year']"
-            ).text
-
-            if current_month == target_month and current_year == target_year:
-                break
+        def read_title():
+            """Reads the month and year of the calendar header in a single round-trip."""
+            return tuple(self.driver.execute_script(
+                "var t = document.querySelector('.ui-datepicker-title');"
+                "return [t.querySelector('.ui-datepicker-month').innerText,"
+                " t.querySelector('.ui-datepicker-year').innerText];"
+            ))
+
+        current_title = read_title()
 
+        # Loop until we find the desired month/year in the calendar header
+        while current_title != (target_month, target_year):
             # If it's not the target month/year, click the "next" arrow
             next_button = self.wait.until(self.EC.element_to_be_clickable(
-                (By.XPATH, "//span[@class='ui-icon ui-icon-circle-triangle-e']")))
+                (By.CSS_SELECTOR, "span.ui-icon.ui-icon-circle-triangle-e")))
             next_button.click()
-            time.sleep(1)
+            # Wait until the header shows the next month
+            previous_title = current_title
+            current_title = self.wait_until(
+                lambda d: (title := read_title()) != previous_title and title
+            )
 
         # Once the correct month/year is displayed, select the check-in date
+        # (XPath is kept here because CSS selectors cannot match on text)
         checkin = self.wait.until(
             self.EC.element_to_be_clickable(
                 (By.XPATH,
                  f"//table[@class='ui-datepicker-calendar']/tbody//a[text()={checkin_day}]"))
         )
         checkin.click()
-        time.sleep(1)
+        # Clicking a day re-renders the calendar; wait for it so the check-out day
+        # is not looked up in the old calendar
+        self.wait_for_staleness(checkin)
 
         # Then select the check-out date
         checkout = self.wait.until(
@@ -144,80 +395,108 @@ class JollyTurSeleniumDriver:
                  f"//table[@class='ui-datepicker-calendar']/tbody//a[text()={checkout_day}]"))
         )
         checkout.click()
-        time.sleep(1)
+        self.wait_for_staleness(checkout)
 
-    def adjust_room_count(self, adult_count=2):
+    def adjust_room_count(self, adult_count=2, window_handle=None):
         """
         Adjusts the number of adults in the room selection dropdown.
 
         :param adult_count: Desired number of adults (integer). Will be capped at 9 for safety.
+        :param window_handle: Tab to run in (see new_tab()). Defaults to the current tab.
         """
+        self.switch_to(window_handle)
+
         if adult_count > 9:
             adult_count = 9  # Prevent selecting more than 9 adults, if that's a site limit
 
         # Click the room/person count section to open its dropdown
         room_dropdown = self.wait.until(self.EC.element_to_be_clickable(
-            (By.XPATH, "//div[contains(@class,'list person-count')]"))
+            (By.CSS_SELECTOR, "div.list.person-count"))
         )
         room_dropdown.click()
-        time.sleep(1)
-        # Sometimes an extra click is needed if the dropdown does not expand fully
-        room_dropdown.click()
-        time.sleep(1)
-
-        # XPath for the current adult count, and the increment/decrement buttons
-        adult_xpath = (
-            "//div[@class='room-count-dropdown hotel-room-count-dropdown show']"
-            "/div[@class='room-info']/div[1]/div[2]//span[contains(@class,'primary-select async adult-number')]"
-        )
-        inc_adult_btn_xpath = (
-            "//div[@class='room-count-dropdown hotel-room-count-dropdown show']"
-            "/div[@class='room-info']/div[1]/div[2]//div[@data-name='inc']"
-        )
-        dec_adult_btn_xpath = (
-            "//div[@class='room-count-dropdown hotel-room-count-dropdown show']"
-            "/div[@class='room-info']/div[1]/div[2]//div[@data-name='dec']"
+        opened_dropdown = (By.CSS_SELECTOR, "div.room-count-dropdown.show")
+        try:
+            self.wait_until(self.EC.visibility_of_element_located(opened_dropdown), timeout=2)
+        except TimeoutException:
+            # Sometimes an extra click is needed if the dropdown does not expand fully
+            room_dropdown.click()
+            self.wait.until(self.EC.visibility_of_element_located(opened_dropdown))
+
+        # CSS selectors for the current adult count, and the increment/decrement buttons
+        adult_row_css = (
+            "div.room-count-dropdown.hotel-room-count-dropdown.show"
+            " > div.room-info > div:nth-of-type(1) > div:nth-of-type(2)"
         )
+        adult_css = f"{adult_row_css} span.primary-select.async.adult-number"
+        inc_adult_btn_css = f"{adult_row_css} div[data-name='inc']"
+        dec_adult_btn_css = f"{adult_row_css} div[data-name='dec']"
+
+        def locate_controls():
+            """Resolves the adult count span and its decrement/increment buttons."""
+            return (
+                self.wait.until(self.EC.presence_of_element_located((By.CSS_SELECTOR, adult_css))),
+                self.wait.until(self.EC.element_to_be_clickable((By.CSS_SELECTOR, dec_adult_btn_css))),
+                self.wait.until(self.EC.element_to_be_clickable((By.CSS_SELECTOR, inc_adult_btn_css)))
+            )
+
+        # The elements are resolved once and reused for every click. If the dropdown is
+        # re-rendered in the meantime, they are resolved again and the click is retried.
+        controls = locate_controls()
+
+        def click_and_wait(button_index, expected_count, max_retries=3):
+            """
+            Clicks the decrement (1) or increment (2) button and waits until the count
+            span shows the expected value, re-resolving stale elements for this click.
+            """
+            nonlocal controls
+            for attempt in range(max_retries + 1):
+                adult_span = controls[0]
+                try:
+                    # A click made before the re-render may already have been applied
+                    if adult_span.text.strip() != str(expected_count):
+                        controls[button_index].click()
+                        self.wait.until(lambda d: adult_span.text.strip() == str(expected_count))
+                    return
+                except StaleElementReferenceException:
+                    if attempt == max_retries:
+                        raise
+                    controls = locate_controls()
 
         # Read the current adult count in the dropdown
-        current_adult_count = self.wait.until(
-            self.EC.presence_of_element_located((By.XPATH, adult_xpath))
-        ).text
-        current_adult_count = int(current_adult_count.strip())
+        try:
+            current_adult_count = int(controls[0].text.strip())
+        except StaleElementReferenceException:
+            controls = locate_controls()
+            current_adult_count = int(controls[0].text.strip())
 
         # Decrement down to 1 adult first, just to have a known baseline
         while current_adult_count > 1:
-            dec_btn = self.wait.until(
-                self.EC.element_to_be_clickable((By.XPATH, dec_adult_btn_xpath))
-            )
-            dec_btn.click()
-            time.sleep(0.5)
-            current_adult_count = int(
-                self.driver.find_element(By.XPATH, adult_xpath).text.strip()
-            )
+            current_adult_count -= 1
+            click_and_wait(1, current_adult_count)
 
         # Then increment up to the desired adult_count
-        for _ in range(adult_count - 1):
-            inc_btn = self.wait.until(
-                self.EC.element_to_be_clickable((By.XPATH, inc_adult_btn_xpath))
-            )
-            inc_btn.click()
-            time.sleep(0.5)
+        while current_adult_count < adult_count:
+            current_adult_count += 1
+            click_and_wait(2, current_adult_count)
 
-    def click_search(self):
+    def click_search(self, window_handle=None):
         """
         Clicks the search button to initiate a hotel search.
+
+        :param window_handle: Tab to run in (see new_tab()). Defaults to the current tab.
         """
+        self.switch_to(window_handle)
         # Locate and click the search button on the form
         search_button = self.wait.until(
             self.EC.element_to_be_clickable((
-                By.XPATH,
-                "//div[@class='travel-planner-inner travel-planner-hotel']/div/div[@class='list action-button']"
+                By.CSS_SELECTOR,
+                "div.travel-planner-inner.travel-planner-hotel > div > div.list.action-button"
             ))
         )
         search_button.click()
 
-    def scroll_and_click_until_all_displayed(self, status_xpath, next_button_xpath):
+    def scroll_and_click_until_all_displayed(self, status_xpath, next_button_xpath,
+                                             window_handle=None):
         """
         Continuously scrolls the page and clicks the "Load more" button
         until a specific status element indicates that all items have been displayed.
@@ -225,45 +504,19 @@ class JollyTurSeleniumDriver:
         :param status_xpath: XPath of the element showing how many items are currently displayed
                             (or whether everything is fully loaded).
         :param next_button_xpath: XPath of the "Load more" button (or next button).
+        :param window_handle: Tab to run in (see new_tab()). Defaults to the current tab.
         """
-
-        def is_in_viewport(elem):
-            """
-            Checks if a given element is currently visible in the viewport
-            by verifying that the center of the element matches the elementFromPoint() call.
-            """
-            return self.driver.execute_script(
-                """
-                var elem = arguments[0],
-                    box = elem.getBoundingClientRect(),
-                    cx = box.left + (box.width / 2),
-                    cy = box.top + (box.height / 2),
-                    e = document.elementFromPoint(cx, cy);
-                return e === elem;
-                """,
-                elem
-            )
+        self.switch_to(window_handle)
 
         def scroll_until_element_visible(xpath, scroll_step=550, max_scrolls=50):
             """
             Scrolls the page down in increments until the specified element
             is visible or a maximum number of scrolls is reached.
+            The whole loop runs inside the browser, in a single WebDriver round-trip.
             """
-            try:
-                element = self.driver.find_element(By.XPATH, xpath)
-            except Exception as e:
-                print(f"Element not found while scrolling: {e}")
-                return None
-
-            scroll_count = 0
-            while not is_in_viewport(element) and scroll_count < max_scrolls:
-                self.driver.execute_script(f"window.scrollBy(0, {scroll_step});")
-                time.sleep(2)
-                scroll_count += 1
-
-            if is_in_viewport(element):
-                return element
-            return None
+            return self.driver.execute_async_script(
+                SCROLL_UNTIL_VISIBLE_JS, xpath, scroll_step, max_scrolls
+            )
 
         while True:
             # Scroll until the status element (e.g., "You have viewed all items") is visible
@@ -272,7 +525,8 @@ class JollyTurSeleniumDriver:
                 print("Status element could not be made visible.")
                 break
 
-            status_text = status_element.text.strip().lower()
+            raw_status_text = status_element.text
+            status_text = raw_status_text.strip().lower()
             print("Status text:", status_text)
 
             # Check if the site indicates that we've loaded all items
@@ -289,12 +543,100 @@ class JollyTurSeleniumDriver:
                 print(f"Could not click the 'next' button: {e}")
                 break
 
-            # Wait a bit for new content to load before checking again
-            time.sleep(5)
+            # Wait for the status text to change, signalling that new content has loaded
+            try:
+                self.wait_until(
+                    lambda d: d.find_element(By.XPATH, status_xpath).text != raw_status_text,
+                    timeout=10
+                )
+            except TimeoutException:
+                print("Status text did not change after clicking 'Load more'.")
 
     def close(self):
         """
         Closes the Selenium WebDriver and quits the browser session.
+        The temporary profile directory, if one was created, is deleted as well.
         """
         self.driver.quit()
-        print("Browser session has been closed.")
\ No newline at end of file
+        if self._temp_user_data_dir:
+            shutil.rmtree(self._temp_user_data_dir, ignore_errors=True)
+        print("Browser session has been closed.")
+
+
+class JollyTurSeleniumPool:
+    """
+    A fixed-size pool of JollyTurSeleniumDriver instances for running several
+    independent searches (destinations, date ranges, party sizes) in parallel.
+
+    Each task blocks on its own browser session, so plain threads are enough.
+    Drivers are checked out of a queue, which lets the pool run more tasks than it has drivers.
+    """
+
+    def __init__(self, size, headless=True, cache_dir=None):
+        """
+        Launches 'size' browsers up front.
+
+        :param size: Number of browser sessions to keep open.
+        :param headless: Forwarded to each JollyTurSeleniumDriver.
+        :param cache_dir: Base directory for persistent HTTP caches. Each browser
+                          gets its own 'worker-<n>' subdirectory.
+        """
+        self.size = size
+        # Resolve and patch the chromedriver binary before the browsers are launched
+        # concurrently; each uc.Chrome then finds it already patched and leaves it alone,
+        # instead of several threads rewriting the same file at once
+        driver_path = _driver_path()
+        uc.Patcher(executable_path=driver_path).auto()
+
+        def launch(worker_id):
+            # Each driver creates (and removes) its own temporary profile, which avoids
+            # Chrome's profile lock; the cache directory must be separate as well
+            return JollyTurSeleniumDriver(
+                headless=headless,
+                driver_path=driver_path,
+                cache_dir=os.path.join(cache_dir, f"worker-{worker_id}") if cache_dir else None
+            )
+
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(launch, worker_id) for worker_id in range(size)]
+        # If any browser failed to start, close the ones that did (and remove their
+        # temporary profiles) before re-raising
+        failed = [f for f in futures if f.exception() is not None]
+        if failed:
+            for future in futures:
+                if future.exception() is None:
+                    future.result().close()
+            raise failed[0].exception()
+        self.drivers = [future.result() for future in futures]
+
+        self._available = queue.Queue()
+        for bot in self.drivers:
+            self._available.put(bot)
+
+    def map(self, task_fn, tasks):
+        """
+        Runs task_fn(bot, task) for every task, each on a free driver from the pool.
+
+        :param task_fn: Callable taking a JollyTurSeleniumDriver and a task,
+                        e.g. one running the open-site/fill-form/scroll flow.
+        :param tasks: Iterable of task arguments.
+        :return: An iterator over the results, in the same order as 'tasks'.
+                 Each result is yielded as soon as it (and the ones before it) is ready.
+        """
+        def run(task):
+            bot = self._available.get()
+            try:
+                return task_fn(bot, task)
+            finally:
+                # Return the driver to the pool so the next task can use it
+                self._available.put(bot)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            yield from executor.map(run, tasks)
+
+    def close(self):
+        """
+        Closes every browser session in the pool.
+        """
+        for bot in self.drivers:
+            bot.close()
@@ -1,8 +1,30 @@
 # scoring.py
 
 import os
+import re
 import json
 
+# Translation table removing thousand separators (dots and spaces) in a single pass
+_THOUSANDS_SEPARATORS = str.maketrans("", "", ". ")
+
+# Precompiled search for the risk-free reservation note in the cancellation policy
+_RISKSIZ = re.compile(r"Risksiz rezervasyon").search
+
+# Accommodation types and their scores, highest first
+_ACCOM_SCORES = (
+    ("ultra her şey dahil", 2.0),
+    ("her şey dahil", 1.5),
+    ("yarım pansiyon", 1.0),
+    ("oda kahvaltı", 0.5),
+    ("sadece oda", 0.3),
+)
+_ACCOM_SCORE_BY_TYPE = dict(_ACCOM_SCORES)
+# Finds every accommodation type in one pass. The lookahead also reports overlapping
+# matches, e.g. both "ultra her şey dahil" and the "her şey dahil" inside it.
+_ACCOM_RE = re.compile(
+    "(?=(" + "|".join(re.escape(accom_type) for accom_type, _ in _ACCOM_SCORES) + "))"
+)
+
 def parse_price(price_str: str) -> float:
     """
     Converts a Turkish format price string (e.g. '43.990,00 TL') to a float (e.g. 43990.00).
@@ -13,21 +35,18 @@ def parse_price(price_str: str) -> float:
     if not price_str:
         return 0.0
     
-    # Remove ' TL' if exists
-    price_str = price_str.replace(" TL", "").strip()
+    # Remove ' TL' if exists, then replace comma (decimal) with dot
+    price_str = price_str.replace(" TL", "").strip().replace(",", ".")
     
-    # Replace comma (decimal) with dot
-    price_str = price_str.replace(",", ".")
-    
-    # Split by dot to handle thousand separators
-    parts = price_str.split(".")
-    if len(parts) > 1:
-        # Join all except the last into an integer part
-        integer_part = "".join(parts[:-1])
-        decimal_part = parts[-1]
-        cleaned_str = integer_part + "." + decimal_part
+    # Only the last dot is the decimal point; drop the thousand separators before it
+    decimal_pos = price_str.rfind(".")
+    if decimal_pos == -1:
+        cleaned_str = price_str
     else:
-        cleaned_str = parts[0]
+        cleaned_str = (
+            price_str[:decimal_pos].translate(_THOUSANDS_SEPARATORS)
+            + "." + price_str[decimal_pos + 1:]
+        )
     
     try:
         return float(cleaned_str)
@@ -47,7 +66,7 @@ def compute_base_score(hotel: dict) -> float:
     
     # 1) Check for 'Risksiz rezervasyon' in cancel_policy
     cancel_policy = hotel.get("cancel_policy", "")
-    if "Risksiz rezervasyon" in cancel_policy:
+    if _RISKSIZ(cancel_policy):
         base_score += 1.0
     
     # 2) If 'recomended_hotel' is not None
@@ -57,22 +76,15 @@ def compute_base_score(hotel: dict) -> float:
     # 3) Count number of features
     features_str = hotel.get("hotel_features", "")
     if features_str:
-        # Split by comma and strip whitespace
-        features_list = [x.strip() for x in features_str.split(",")]
-        base_score += 0.05 * len(features_list)
+        # Features are comma separated; count the commas instead of building a list
+        base_score += 0.05 * (features_str.count(",") + 1)
     
-    # 4) Accommodation types scoring
+    # 4) Accommodation types scoring: the best matching type counts
     accom = hotel.get("accommodation_types", "").strip().lower()
-    if "ultra her şey dahil" in accom:
-        base_score += 2.0
-    elif "her şey dahil" in accom:
-        base_score += 1.5
-    elif "yarım pansiyon" in accom:
-        base_score += 1.0
-    elif "oda kahvaltı" in accom:
-        base_score += 0.5
-    elif "sadece oda" in accom:
-        base_score += 0.3
+    base_score += max(
+        (_ACCOM_SCORE_BY_TYPE[accom_type] for accom_type in _ACCOM_RE.findall(accom)),
+        default=0.0
+    )
     
     return base_score
 
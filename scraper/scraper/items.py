@@ -3,6 +3,9 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
+from dataclasses import dataclass
+from typing import Optional
+
 import scrapy
 
 
@@ -10,3 +13,23 @@ class ScraperItem(scrapy.Item):
     # define the fields for your item here like:
     # name = scrapy.Field()
     pass
+
+
+@dataclass(slots=True)
+class Hotel:
+    """
+    Compact, slot-based representation of a scraped hotel, used where many
+    hotels are held in memory (e.g. by ScorePipeline). The field names match
+    the keys of the dictionaries yielded by JollySpider.
+    """
+    detail_page_url: Optional[str] = None
+    hotel_name: Optional[str] = None
+    price: Optional[str] = None
+    location: Optional[str] = None
+    accommodation_types: Optional[str] = None
+    checkin_time: Optional[str] = None
+    checkout_time: Optional[str] = None
+    hotel_features: Optional[str] = None
+    cancel_policy: Optional[str] = None
+    recomended_hotel: Optional[str] = None
+    final_score: float = 0.0
@@ -1,14 +1,17 @@
 # middlewares.py
 
+import time
 import random
+import itertools
+from collections import defaultdict
 from scrapy import signals
 from scrapy.downloadermiddlewares.useragent import UserAgentMiddleware
 
 
 class RandomUserAgentMiddleware(UserAgentMiddleware):
     """
-    Middleware that assigns a random User-Agent string to each request.
-    Inherits from Scrapy's built-in UserAgentMiddleware.
+    Middleware that assigns a rotating User-Agent string to each request.
+    The list is shuffled once and then cycled through. Inherits from Scrapy's built-in UserAgentMiddleware.
     """
 
     def __init__(self, settings, user_agent='Scrapy'):
@@ -26,6 +29,11 @@ class RandomUserAgentMiddleware(UserAgentMiddleware):
         # if not found, store a default list with one entry.
         self.user_agent_list = settings.get('USER_AGENT_LIST', [user_agent])
 
+        # Shuffle the list once, then rotate through it instead of drawing at random per request
+        self._ua_iter = itertools.cycle(
+            random.sample(self.user_agent_list, len(self.user_agent_list))
+        )
+
     @classmethod
     def from_crawler(cls, crawler):
         """
@@ -47,22 +55,21 @@ class RandomUserAgentMiddleware(UserAgentMiddleware):
 
     def process_request(self, request, spider):
         """
-        Assign a random User-Agent header to each outgoing request.
+        Assign the next User-Agent header from the rotation to each outgoing request.
 
         Args:
             request (scrapy.http.Request): The request object.
             spider (scrapy.spiders.Spider): The active spider instance.
         """
-        # Choose a random user agent from the list
-        user_agent = random.choice(self.user_agent_list)
-
-        # Set the User-Agent header if it is not already defined
-        request.headers.setdefault('User-Agent', user_agent)
+        # Set the next user agent in the rotation if the header is not already defined
+        request.headers.setdefault('User-Agent', next(self._ua_iter))
 
 
 class ProxyMiddleware:
     """
     Middleware that assigns a random proxy address to each request.
+    Proxies that fail are skipped for a cool-off period that grows
+    exponentially with their consecutive failures (capped at 5 minutes).
     """
 
     def __init__(self, proxies):
@@ -74,6 +81,10 @@ class ProxyMiddleware:
         """
         super(ProxyMiddleware, self).__init__()
         self.proxies = proxies
+        # Consecutive failures per proxy
+        self.fails = defaultdict(int)
+        # Proxy -> time (epoch seconds) before which it should not be used
+        self.cooldown = {}
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -102,8 +113,45 @@ class ProxyMiddleware:
             request (scrapy.http.Request): The request object.
             spider (scrapy.spiders.Spider): The active spider instance.
         """
-        # Pick a random proxy from the self.proxies list
-        proxy = random.choice(self.proxies)
+        # Pick a random proxy among the healthy ones, or among all of them if none is healthy
+        now = time.time()
+        healthy = [p for p in self.proxies if self.cooldown.get(p, 0) <= now]
+        proxy = random.choice(healthy or self.proxies)
 
         # Set the 'proxy' meta key so Scrapy routes the request through the chosen proxy
         request.meta['proxy'] = proxy
+
+    def process_response(self, request, response, spider):
+        """
+        Reset the failure count of the proxy that served a response.
+
+        Args:
+            request (scrapy.http.Request): The request object.
+            response (scrapy.http.Response): The downloaded response.
+            spider (scrapy.spiders.Spider): The active spider instance.
+
+        Returns:
+            The response, unchanged.
+        """
+        proxy = request.meta.get('proxy')
+        if proxy in self.fails:
+            del self.fails[proxy]
+            self.cooldown.pop(proxy, None)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        """
+        Put the proxy used by a failed request in cool-off, backing off exponentially.
+
+        Args:
+            request (scrapy.http.Request): The request object.
+            exception (Exception): The download error.
+            spider (scrapy.spiders.Spider): The active spider instance.
+        """
+        proxy = request.meta.get('proxy')
+        if proxy not in self.proxies:
+            return
+        self.fails[proxy] += 1
+        self.cooldown[proxy] = time.time() + min(300, 2 ** self.fails[proxy])
+        spider.logger.info(
+            f"Proxy {proxy} failed {self.fails[proxy]} time(s), skipping it for a while.")
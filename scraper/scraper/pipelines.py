@@ -2,29 +2,50 @@
 
 from itemadapter import ItemAdapter
 import os
-import json
+import heapq
+import itertools
+import orjson
 from scoring import compute_final_score
+from scraper.items import Hotel
 
 class ScorePipeline:
     """
-    A pipeline that accumulates all scraped hotel items in memory, computes a 
-    final score for each, then writes only the top 10 results to a JSON file 
-    when the spider closes.
+    A pipeline that computes a final score for each scraped hotel item as it
+    arrives, writes every scored hotel to a JSON Lines file, keeps only the
+    10 best ones in a bounded min-heap, then writes them to a JSON file when
+    the spider closes.
     """
 
     def __init__(self):
         """
-        Initialize the pipeline with an empty list to store hotel items.
+        Initialize the pipeline with an empty heap of scored hotel items.
         
         Attributes:
-            hotels (list): A list to store hotel items throughout the spider run.
+            heap (list): A min-heap of (final_score, tie_breaker, Hotel) tuples
+                holding at most 10 hotels, with the lowest score at the root.
         """
-        self.hotels = []
+        self.heap = []
+        # Monotonic counter used to break score ties without comparing dicts
+        self._counter = itertools.count()
+        # JSON Lines file receiving every scored hotel, opened in open_spider
+        self.all_file = None
+
+    def open_spider(self, spider):
+        """
+        Open the JSON Lines file that receives every scored hotel as it is processed.
+        The file is rewritten on each crawl, like the top 10 file.
+
+        Args:
+            spider (scrapy.spiders.Spider): The spider that has started running.
+        """
+        all_path = f"output/{spider.destination}_all.jsonl"
+        os.makedirs(os.path.dirname(all_path), exist_ok=True)
+        self.all_file = open(all_path, "wb")
 
     def process_item(self, item, spider):
         """
-        Process each scraped item, converting it to a dictionary and storing 
-        it in the pipeline's internal list.
+        Process each scraped item: convert it to a slot-based Hotel, compute
+        its final score and keep it only if it is among the 10 best seen so far.
 
         Args:
             item (dict or scrapy.Item): The scraped hotel item.
@@ -33,41 +54,48 @@ class ScorePipeline:
         Returns:
             The original item, which is passed on to the next pipeline (if any).
         """
-        # Convert item to a dictionary and append it to the hotels list
-        self.hotels.append(dict(item))
+        adapter = ItemAdapter(item)
+        hotel = Hotel(**{name: adapter.get(name) for name in Hotel.__dataclass_fields__
+                         if name != "final_score"})
+        hotel.final_score = compute_final_score(adapter)
+
+        # Write the scored hotel right away, so no burst of I/O is left for the end of the crawl
+        self.all_file.write(orjson.dumps(hotel) + b"\n")
+
+        # Negated counter: on equal scores the earlier hotel ranks higher
+        entry = (hotel.final_score, -next(self._counter), hotel)
+        if len(self.heap) < 10:
+            heapq.heappush(self.heap, entry)
+        else:
+            # Push the new hotel and drop the lowest scored one
+            heapq.heappushpop(self.heap, entry)
         return item
 
     def close_spider(self, spider):
         """
         Perform final operations after the spider finishes:
         
-        1) Compute the final_score for each hotel.
-        2) Sort the hotels in descending order by final_score.
-        3) Slice the top 10 hotels.
-        4) Write these top 10 hotels to a JSON file under the 'output' directory.
+        1) Close the JSON Lines file of all scored hotels.
+        2) Sort the kept hotels in descending order by final_score.
+        3) Write these top 10 hotels to a JSON file under the 'output' directory.
         
         Args:
             spider (scrapy.spiders.Spider): The spider that has finished running.
         """
-        # 1) Compute final_score for each hotel
-        for hotel in self.hotels:
-            hotel["final_score"] = compute_final_score(hotel)
-
-        # 2) Sort hotels by final_score in descending order
-        hotels_sorted = sorted(
-            self.hotels,
-            key=lambda x: x["final_score"],
-            reverse=True
-        )
+        # 1) Every hotel has already been written to the JSON Lines file
+        self.all_file.close()
 
-        # 3) Take the first 10 hotels
-        top_10_hotels = hotels_sorted[:10]
+        # 2) The heap already holds the top 10 hotels; only they need sorting
+        top_10_hotels = [hotel for _, _, hotel in sorted(self.heap, reverse=True)]
 
-        # 4) Write these top 10 hotels to a JSON file
+        # 3) Write these top 10 hotels to a JSON file
         output_path = f"output/{spider.destination}_scored.json"
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as out:
-            json.dump(top_10_hotels, out, ensure_ascii=False, indent=4)
+        # orjson serializes the Hotel dataclasses straight to UTF-8 bytes in a single pass
+        with open(output_path, "wb") as out:
+            out.write(orjson.dumps(
+                top_10_hotels, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
 
         # Print a confirmation message
         print(
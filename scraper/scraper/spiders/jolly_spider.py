@@ -3,11 +3,66 @@ Scrapy spider that integrates with the Selenium driver defined in jolly_selenium
 """
 
 import re
-import time
 import scrapy
-from scrapy.selector import Selector
+import lxml.html
+from scrapy import signals
+from lxml import etree
 from selenium.webdriver.common.by import By
-from jolly_selenium import JollyTurSeleniumDriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from jolly_selenium import JollyTurSeleniumDriver, JollyTurSeleniumPool
+
+
+# XPath expressions compiled once at import time and reused for every page.
+# List page: every listed hotel, and the listings showing an error alert (e.g. no
+# availability). Two single-pass selections are cheaper than a not(descendant::...)
+# predicate re-evaluated for every listed hotel.
+_XP_HOTEL_LISTINGS = etree.XPath("//div[@class='list']")
+_XP_ERROR_LISTINGS = etree.XPath(
+    "//div[@class='alert alert-danger alert-error']/ancestor::div[@class='list']")
+# Detail page. Fields that live in the same block are evaluated relative to that
+# block's node, which is located once, instead of searching the whole document each time.
+_XP_GENERAL_INFO_TAB = etree.XPath("//ul[@class='etabs']/li/a[@href='#genel-bilgiler']")
+_XP_RESERVATION_COL = etree.XPath("//div[@class='reservation-col']")
+_XP_PRICE = etree.XPath(
+    "normalize-space(div[@class='col total-price']/span[contains(@class,'current-price')])")
+_XP_CANCEL_POLICY = etree.XPath(
+    "div[contains(@class,'cancelPolicy-badge')]/@data-content", smart_strings=False)
+_XP_RECOMMENDED = etree.XPath(
+    "//div[@class='detailrecommend']/@data-content", smart_strings=False)
+_XP_HOTEL_NAME = etree.XPath("//h1[@class='title']/@title", smart_strings=False)
+_XP_LOCATION = etree.XPath(
+    "//ul[@class='title-bottom-info']/li/a[@title='Maps']/text()", smart_strings=False)
+_XP_ACCOMMODATION = etree.XPath(
+    "//div[@class='meal-type-info-content']//div[@class='info']/div//text()",
+    smart_strings=False)
+_XP_CHECKIN_CHECKOUT = etree.XPath("//div[@class='checkin-checkout']")
+_XP_CHECKIN = etree.XPath(
+    ".//span[@class='title' and contains(., 'Check-in')]/following-sibling::span/text()",
+    smart_strings=False)
+_XP_CHECKOUT = etree.XPath(
+    ".//span[@class='title' and contains(., 'Check-out')]/following-sibling::span/text()",
+    smart_strings=False)
+# The "Otel Özellikleri" title, then the <ul class='detail-list'> that follows it.
+_XP_FEATURES = etree.XPath(
+    "//div[@class='hotel-deatil-box']/header[span[@class='title' and contains(., 'Otel Özellikleri')]]"
+    "/following-sibling::div[@class='content']/ul[@class='detail-list']/li")
+
+
+def _first(results):
+    """
+    Returns the first result of a compiled XPath, or None if nothing matched.
+    """
+    return results[0] if results else None
+
+
+def _to_bool(value):
+    """
+    Converts a spider argument to a boolean. Arguments passed with -a are strings,
+    so values like "false", "0" or "no" must be treated as False.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "no", "off")
+    return bool(value)
 
 
 class JollySpider(scrapy.Spider):
@@ -19,7 +74,18 @@ class JollySpider(scrapy.Spider):
     name = "jolly"
     allowed_domains = ["jollytur.com"]
     custom_settings = {
-        "LOG_LEVEL": "INFO"
+        "LOG_LEVEL": "INFO",
+        # Detail pages are all on jollytur.com; fetch up to 16 of them at a time
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 16,
+        # Stream the raw items to disk as they are scraped, 50 per file, so a
+        # crash midway only loses the hotels that were still in flight
+        "FEEDS": {
+            "output/%(destination)s-%(batch_id)d.jsonl": {
+                "format": "jsonlines",
+                "encoding": "utf8"
+            }
+        },
+        "FEED_EXPORT_BATCH_ITEM_COUNT": 50
     }
 
     def __init__(
@@ -30,6 +96,9 @@ class JollySpider(scrapy.Spider):
         checkin_day="4",
         checkout_day="8",
         adult_count="3",
+        headless="true",
+        render_details="false",
+        detail_workers="4",
         *args,
         **kwargs
     ):
@@ -38,7 +107,7 @@ class JollySpider(scrapy.Spider):
 
         Example usage:
           scrapy crawl jolly -a destination=Ölüdeniz -a target_month=Ağustos -a target_year=2025 \
-                             -a checkin_day=4 -a checkout_day=8 -a adult_count=3
+                             -a checkin_day=4 -a checkout_day=8 -a adult_count=3 -a headless=false
 
         :param destination: The destination to search for (e.g., "Ölüdeniz").
         :param target_month: The target check-in month as a string (e.g., "Ağustos").
@@ -46,6 +115,13 @@ class JollySpider(scrapy.Spider):
         :param checkin_day: The day of the month to check in (string).
         :param checkout_day: The day of the month to check out (string).
         :param adult_count: Number of adults (string), which will be converted to int.
+        :param headless: Whether to run the browser in headless mode (default "true").
+                         Pass "false" to see the browser in action.
+        :param render_details: If "true", hotel detail pages are opened with Selenium
+                               instead of plain HTTP requests (default "false").
+                               Only needed if the detail pages stop rendering without JavaScript.
+        :param detail_workers: Number of browsers opening detail pages in parallel
+                               when render_details is set (string, default "4").
         """
         super().__init__(*args, **kwargs)
         self.destination = destination
@@ -54,11 +130,38 @@ class JollySpider(scrapy.Spider):
         self.checkin_day = checkin_day
         self.checkout_day = checkout_day
         self.adult_count = int(adult_count)
+        self.headless = _to_bool(headless)
+        self.render_details = _to_bool(render_details)
+        self.detail_workers = int(detail_workers)
+        # Selenium session cookies and User-Agent, copied once the search results are loaded
+        self.session_cookies = {}
+        self.user_agent = None
+
+        # The Selenium driver is started in spider_opened and closed in spider_closed.
+        self.bot = None
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        """
+        Creates the spider and ties the Selenium driver's lifecycle to the crawl,
+        so the browser opens once per crawl and is closed even if the crawl fails.
+
+        :param crawler: The Scrapy crawler instance.
+        :return: The spider instance.
+        """
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(spider.spider_closed, signal=signals.spider_closed)
+        return spider
+
+    def spider_opened(self, spider):
+        """
+        Starts the Selenium driver when the crawl begins.
+        Headless by default; pass -a headless=false to see the browser in action.
 
-        # Initialize the Selenium driver.
-        # Set headless=False if you want to see the browser in action.
-        # Set headless=True for a headless mode in production.
-        self.bot = JollyTurSeleniumDriver(headless=False)
+        :param spider: The spider that was opened (this spider).
+        """
+        self.bot = JollyTurSeleniumDriver(headless=self.headless)
 
     def start_requests(self):
         """
@@ -77,7 +180,10 @@ class JollySpider(scrapy.Spider):
           1) Opens the site using Selenium.
           2) Enters the search form data (destination, dates, adult count).
           3) Scrolls through the results to load them all.
-          4) Collects hotel URLs and navigates to each hotel's detail page.
+          4) Collects hotel URLs and requests each hotel's detail page.
+             Detail pages are plain HTML, so they are fetched concurrently by Scrapy,
+             reusing the Selenium session cookies. Selenium is only used for them
+             when render_details is set.
         """
         self.logger.info("Navigating to the site using Selenium...")
         # Open the main site via Selenium driver.
@@ -100,148 +206,273 @@ class JollySpider(scrapy.Spider):
         # Click the search button.
         self.bot.click_search()
 
-        # Wait for the results to load.
-        time.sleep(8)
-
         # Scroll through the results until all are displayed.
         # We use two XPath expressions:
         # - 'status_xpath' to identify how many hotels are currently shown
         # - 'next_button_xpath' for the "Load more" button, if present
         status_xpath = "//div[@class='listMoreCt']/span[@class='moreTextList']"
         next_button_xpath = "//div[@class='listMoreCt']/a/button"
+
+        # Wait for the results to load (the status element appears with the first results).
+        # Searches without results, or whose results fit on one page, have no status
+        # element; continue with whatever hotels were rendered.
+        try:
+            self.bot.wait_until(
+                self.bot.EC.presence_of_element_located((By.XPATH, status_xpath)), timeout=30
+            )
+        except TimeoutException:
+            self.logger.info(
+                "The results status element did not appear; continuing with the hotels shown.")
+
         self.bot.scroll_and_click_until_all_displayed(status_xpath, next_button_xpath)
 
-        # Additional waiting time to ensure final elements are loaded.
-        time.sleep(5)
+        # Wait until every hotel announced in the status text has been rendered.
+        self._wait_for_listed_hotels(status_xpath)
+
+        # Copy the browser's session cookies once the results are loaded (including any
+        # set by the search itself), so that the detail page requests sent by Scrapy
+        # belong to the same search session.
+        self.session_cookies = {
+            c["name"]: c["value"] for c in self.bot.driver.get_cookies()
+        }
+        # Send the browser's own User-Agent with them, so the site serves the same
+        # (desktop) markup and the cookies are not tied to a different browser.
+        self.user_agent = self.bot.driver.execute_script("return navigator.userAgent")
 
-        # Convert current page source into a Scrapy Selector.
+        # Parse the current page source with lxml.
         list_html_source = self.bot.driver.page_source
-        sel = Selector(text=list_html_source)
+        tree = lxml.html.fromstring(list_html_source)
 
         self.logger.info(
-            "Extracting hotel URLs from the list page using Scrapy Selector...")
+            "Extracting hotel URLs from the list page using lxml...")
 
         # Extract data-url attributes that contain the detail pages.
         # Note: We exclude not available hotels with the alert-danger class.
-        hotel_urls = sel.xpath(
-            "//div[@class='list' and not(descendant::div[@class='alert alert-danger alert-error'])]/@data-url"
-        ).getall()
+        # The same hotel can be listed more than once (e.g. for different room
+        # combinations); keep the first occurrence of each URL, in order.
+        # The alert is checked per listing, so an unavailable listing does not hide
+        # an available listing of the same hotel.
+        error_listings = set(_XP_ERROR_LISTINGS(tree))
+        hotel_urls = list(dict.fromkeys(
+            listing.get("data-url") for listing in _XP_HOTEL_LISTINGS(tree)
+            if listing not in error_listings and listing.get("data-url") is not None))
+
+        self.logger.info(f"Found {len(hotel_urls)} hotels on the list page.")
+
+        if self.render_details:
+            # Open the detail pages with a pool of browsers, several hotels at a time.
+            pool = JollyTurSeleniumPool(self.detail_workers, headless=self.headless)
+            try:
+                for bot in pool.drivers:
+                    self._share_session(bot)
+                for detail_data in pool.map(self.render_hotel_details, hotel_urls):
+                    if detail_data:
+                        yield detail_data
+            finally:
+                pool.close()
+        else:
+            # Let Scrapy download the detail pages concurrently with the browser's cookies.
+            # Scrapy's downloader keeps persistent (keep-alive) connections per host,
+            # so the TLS handshake with jollytur.com is not repeated for every hotel.
+            for url in hotel_urls:
+                yield scrapy.Request(
+                    self._absolutize(url),
+                    callback=self.parse_hotel_details,
+                    cookies=self.session_cookies,
+                    # Takes precedence over RandomUserAgentMiddleware, which only sets a default
+                    headers={"User-Agent": self.user_agent},
+                    dont_filter=True
+                )
+
+    def spider_closed(self, spider, reason):
+        """
+        Closes the Selenium browser session once the crawl has finished,
+        including when it was stopped by an error or Ctrl-C.
 
-        self.logger.info(f"Found {len(hotel_urls)} hotels via Selector.")
+        :param spider: The spider that was closed (this spider).
+        :param reason: Why the spider was closed (e.g. "finished").
+        """
+        if self.bot is not None:
+            self.bot.close()
+            self.bot = None
 
-        # For each hotel, open the detail page and extract the data.
-        for url in hotel_urls:
-            self.logger.info(f"Opening hotel detail page: {url}")
-            detail_data = self.parse_hotel_details(url)
-            if detail_data:
-                yield detail_data
+    @staticmethod
+    def _absolutize(url):
+        """
+        Constructs the full URL if the given URL starts with "/".
 
-        # Close the Selenium browser session.
-        self.bot.close()
-        time.sleep(3)
+        :param url: The relative or absolute URL of a jollytur.com page.
+        :return: The absolute URL.
+        """
+        if url.startswith("/"):
+            return "https://www.jollytur.com" + url
+        return url
 
-    def parse_hotel_details(self, partial_url):
+    def _wait_for_listed_hotels(self, status_xpath, timeout=10):
+        """
+        Waits until the number of hotel entries on the list page reaches the
+        largest number mentioned in the status text (the total hotel count).
+
+        :param status_xpath: XPath of the element showing how many hotels are displayed.
+        :param timeout: Maximum number of seconds to wait.
+        """
+        try:
+            status_text = self.bot.driver.find_element(By.XPATH, status_xpath).text
+        except self.bot.NoSuchElementException:
+            return
+        counts = [int(n) for n in re.findall(r"\d+", status_text.replace(".", ""))]
+        if not counts:
+            return
+        expected = max(counts)
+
+        try:
+            self.bot.wait_until(
+                lambda d: len(d.find_elements(
+                    By.XPATH, "//div[@class='list'][@data-url]")) >= expected,
+                timeout=timeout
+            )
+        except TimeoutException:
+            self.logger.info(
+                f"Timed out waiting for {expected} hotels; continuing with those loaded.")
+
+    def _share_session(self, bot):
+        """
+        Copies the search session cookies into another browser, so that it
+        sees the same prices as the browser that ran the search.
+
+        :param bot: The JollyTurSeleniumDriver to prepare.
+        """
+        # Cookies can only be set for the domain of the currently open page
+        bot.driver.get("https://www.jollytur.com/")
+        for name, value in self.session_cookies.items():
+            bot.driver.add_cookie({"name": name, "value": value})
+
+    def render_hotel_details(self, bot, partial_url):
         """
         Opens the hotel detail page with Selenium, waits for relevant elements,
         and extracts additional information (e.g., hotel name, price, features).
+        Called from the browser pool's worker threads.
 
+        :param bot: The JollyTurSeleniumDriver to use.
         :param partial_url: The relative or absolute URL of the hotel detail page.
-        :return: A dictionary of extracted detail data.
-        """
-        # Construct the full URL if the partial_url starts with "/".
-        full_url = partial_url
-        if partial_url.startswith("/"):
-            full_url = "https://www.jollytur.com" + partial_url
-
-        # Navigate to the detailed page in Selenium.
-        self.bot.driver.get(full_url)
-
-        # Extract the price using an explicit wait to ensure the element is
-        # present.
-        price = self.bot.wait.until(
-            self.bot.EC.presence_of_element_located((
-                By.XPATH,
-                "//div[@class='reservation-col']/div[@class='col total-price']"
-                "/span[contains(@class,'current-price')]"
-            ))
-        ).text
+        :return: A dictionary of extracted detail data, or None if the page could
+                 not be loaded (so one failing hotel does not stop the others).
+        """
+        full_url = self._absolutize(partial_url)
+        self.logger.info(f"Opening hotel detail page: {full_url}")
 
-        # Extract the cancellation policy from 'data-content' attribute,
-        # then remove any HTML tags using a regex.
-        cancel_policy_element = self.bot.driver.find_element(
-            By.XPATH,
-            "//div[@class='reservation-col']/div[contains(@class,'cancelPolicy-badge')]")
-        cancel_policy_html = cancel_policy_element.get_attribute(
-            "data-content")
-        cancel_policy = re.sub(
-            r"<[^>]*>", "", cancel_policy_html or "").strip()
-
-        # Extract recommended hotel info from detailrecommend div
         try:
-            recomended_hotel_element = self.bot.driver.find_element(
-                By.XPATH, "//div[@class='detailrecommend']"
+            # Navigate to the detailed page in Selenium.
+            bot.driver.get(full_url)
+
+            # Wait until the price is present; the other fields are rendered with it.
+            bot.wait.until(
+                bot.EC.presence_of_element_located((
+                    By.XPATH,
+                    "//div[@class='reservation-col']/div[@class='col total-price']"
+                    "/span[contains(@class,'current-price')]"
+                ))
             )
-            recomended_hotel = recomended_hotel_element.get_attribute(
-                "data-content")
-        except self.bot.NoSuchElementException:
-            recomended_hotel = None
 
-        # Click on the "Genel Bilgiler" tab (general info section).
-        try:
-            self.bot.driver.find_element(
-                By.XPATH,
-                "//ul[@class='etabs']/li/a[@href='#genel-bilgiler']"
-            ).click()
-        except self.bot.NoSuchElementException:
-            # if general info tab is not found, no need to proceed.
-            self.logger.info("Could not find the 'Genel Bilgiler' tab.")
+            # Fetch the page source once and extract every field in-process with lxml,
+            # instead of one WebDriver round-trip per field. The "Genel Bilgiler" tab
+            # content is already in the DOM (tabs are only toggled with CSS), so the
+            # tab does not need to be clicked.
+            detail_html_source = bot.driver.page_source
+        except WebDriverException as e:
+            # TimeoutException is a WebDriverException as well
+            self.logger.warning(f"Could not load hotel detail page {full_url}: {e!r}")
+            return None
+
+        tree = lxml.html.fromstring(detail_html_source)
+        return self._extract_hotel_details(tree, full_url)
+
+    def parse_hotel_details(self, response):
+        """
+        Scrapy callback extracting the hotel details from a detail page
+        downloaded by Scrapy, without going through the browser.
+
+        :param response: The detail page response.
+        :return: Yields a dictionary of extracted detail data, so it reaches the
+                 item pipelines and feed exports as soon as the page is parsed.
+                 Pages without a price yield nothing.
+        """
+        tree = lxml.html.fromstring(response.text)
+        item = self._extract_hotel_details(tree, response.url)
+        if item is None:
+            return
+        # Without a price the hotel would be scored as if it cost 1 TL and top the
+        # ranking. The browser path waits for the price; here it may be missing from
+        # the HTML (e.g. rendered by JavaScript), so such hotels are skipped.
+        if not item["price"]:
+            self.logger.warning(f"No price found on {response.url}; skipping the hotel.")
             return
-        time.sleep(3)
+        yield item
 
-        # Convert the detail page's HTML source into a Scrapy Selector.
-        detail_html_source = self.bot.driver.page_source
-        sel = Selector(text=detail_html_source)
+    def _extract_hotel_details(self, tree, detail_page_url):
+        """
+        Extracts all hotel details from the parsed HTML of a detail page.
+
+        :param tree: The lxml tree of a hotel detail page.
+        :param detail_page_url: The absolute URL of the detail page.
+        :return: A dictionary of extracted detail data, or None if the page
+                 has no "Genel Bilgiler" (general info) tab.
+        """
+        # If the general info tab is not found, no need to proceed.
+        if not _XP_GENERAL_INFO_TAB(tree):
+            self.logger.info("Could not find the 'Genel Bilgiler' tab.")
+            return None
+
+        # Locate the reservation block once; price and cancel policy are read from it.
+        reservation = _first(_XP_RESERVATION_COL(tree))
+
+        # Extract the price.
+        price = _XP_PRICE(reservation) if reservation is not None else ""
+
+        # Extract the cancellation policy from 'data-content' attribute,
+        # then keep only its text (tags removed, entities decoded) using lxml.
+        cancel_policy_html = (
+            _first(_XP_CANCEL_POLICY(reservation)) if reservation is not None else None
+        )
+        cancel_policy = ""
+        if cancel_policy_html:
+            cancel_policy = lxml.html.fragment_fromstring(
+                cancel_policy_html, create_parent="div").text_content().strip()
+
+        # Extract recommended hotel info from detailrecommend div (None if missing).
+        recomended_hotel = _first(_XP_RECOMMENDED(tree))
 
         # Extract the hotel name.
-        hotel_name = sel.xpath("//h1[@class='title']/@title").get()
+        hotel_name = _first(_XP_HOTEL_NAME(tree))
         if hotel_name:
             hotel_name = hotel_name.strip()
 
         # Extract the location from the Maps anchor.
-        location = sel.xpath(
-            "//ul[@class='title-bottom-info']/li/a[@title='Maps']/text()").get()
+        location = _first(_XP_LOCATION(tree))
 
         # Extract accommodation types (e.g., Ultra Her Şey Dahil).
-        accommodation_types_list = sel.xpath(
-            "//div[@class='meal-type-info-content']//div[@class='info']/div//text()"
-        ).getall()
-        accommodation_types = "".join(
-            t.strip() for t in accommodation_types_list if t.strip())
-
-        # Extract check-in and check-out times.
-        checkin_time = sel.xpath(
-            "//div[@class='checkin-checkout']"
-            "//span[@class='title' and contains(., 'Check-in')]/following-sibling::span/text()"
-        ).get()
-
-        checkout_time = sel.xpath(
-            "//div[@class='checkin-checkout']"
-            "//span[@class='title' and contains(., 'Check-out')]/following-sibling::span/text()"
-        ).get()
+        # Whitespace is collapsed by str.split()/str.join() on the joined text.
+        accommodation_types_list = _XP_ACCOMMODATION(tree)
+        accommodation_types = " ".join("".join(accommodation_types_list).split())
+
+        # Extract check-in and check-out times from the same block.
+        checkin_checkout = _first(_XP_CHECKIN_CHECKOUT(tree))
+        checkin_time = checkout_time = None
+        if checkin_checkout is not None:
+            checkin_time = _first(_XP_CHECKIN(checkin_checkout))
+            checkout_time = _first(_XP_CHECKOUT(checkin_checkout))
 
         # Extract the hotel features. We locate the "Otel Özellikleri" title
         # and then find the <ul class='detail-list'> that follows it.
-        features_list = sel.xpath(
-            "//div[@class='hotel-deatil-box']/header[span[@class='title' and contains(., 'Otel Özellikleri')]]"
-            "/following-sibling::div[@class='content']/ul[@class='detail-list']/li//text()").getall()
-        hotel_features = ", ".join(f.strip()
-                                   for f in features_list if f.strip())
+        # One feature per <li>, with its whitespace collapsed.
+        features_list = (" ".join(li.text_content().split()) for li in _XP_FEATURES(tree))
+        hotel_features = ", ".join(f for f in features_list if f)
 
         self.logger.info(f"Extracted hotel detail - Name: {hotel_name}")
 
         # Return a dictionary with all the extracted details.
         return {
-            "detail_page_url": full_url,
+            "detail_page_url": detail_page_url,
             "hotel_name": hotel_name,
             "price": price,
             "location": location,